@@ -3,11 +3,13 @@ Create sample changepoint and correlation results for dashboard testing
 Based on historical analysis of Brent oil prices
 """
 
+import hashlib
+import os
+
 import pandas as pd
-from datetime import datetime
 
-# Create sample changepoint results based on known historical events
-changepoints = [
+# Sample changepoint results based on known historical events
+CHANGEPOINTS = [
     {
         'changepoint_id': 1,
         'index': 850,
@@ -31,12 +33,8 @@ changepoints = [
     }
 ]
 
-cp_df = pd.DataFrame(changepoints)
-cp_df.to_csv('outputs/data/changepoint_results.csv', index=False)
-print("✓ Created changepoint_results.csv")
-
-# Create sample event correlations
-correlations = [
+# Sample event correlations
+CORRELATIONS = [
     # Gulf War correlations
     {
         'changepoint_date': '1990-08-02',
@@ -98,15 +96,50 @@ correlations = [
     }
 ]
 
-corr_df = pd.DataFrame(correlations)
-corr_df.to_csv('outputs/data/event_correlations.csv', index=False)
-print("✓ Created event_correlations.csv")
 
-print("\n" + "="*60)
-print("Sample results created successfully!")
-print("="*60)
-print("\nYou can now run the dashboard:")
-print("1. Backend: cd dashboard/backend && python app.py")
-print("2. Frontend: cd dashboard/frontend && npm start")
-print("\nNote: These are sample results based on historical analysis.")
-print("Run the full Bayesian analysis later for actual results.")
+def _write_if_changed(df: pd.DataFrame, path: str) -> None:
+    """Write the frame as Parquet, skipping when content is unchanged.
+
+    A hash sidecar next to the output file records what was last
+    written, so repeat runs (and imports from notebooks) don't rewrite
+    identical files and trip file-watchers for nothing.
+    """
+    digest = hashlib.blake2b(
+        df.to_csv(index=False).encode(), digest_size=16).hexdigest()
+    sidecar = path + '.sha'
+
+    if os.path.exists(path) and os.path.exists(sidecar):
+        with open(sidecar) as f:
+            if f.read().strip() == digest:
+                print(f"✓ {os.path.basename(path)} is up to date, skipped")
+                return
+
+    df.to_parquet(path, engine='pyarrow', compression='snappy', index=False)
+    with open(sidecar, 'w') as f:
+        f.write(digest)
+    print(f"✓ Created {os.path.basename(path)}")
+
+
+def main() -> None:
+    cp_df = pd.DataFrame(CHANGEPOINTS)
+    for col in ('date', 'lower_ci', 'upper_ci'):
+        cp_df[col] = pd.to_datetime(cp_df[col])
+    _write_if_changed(cp_df, 'outputs/data/changepoint_results.parquet')
+
+    corr_df = pd.DataFrame(CORRELATIONS)
+    for col in ('changepoint_date', 'event_date'):
+        corr_df[col] = pd.to_datetime(corr_df[col])
+    _write_if_changed(corr_df, 'outputs/data/event_correlations.parquet')
+
+    print("\n" + "=" * 60)
+    print("Sample results created successfully!")
+    print("=" * 60)
+    print("\nYou can now run the dashboard:")
+    print("1. Backend: cd dashboard/backend && python app.py")
+    print("2. Frontend: cd dashboard/frontend && npm start")
+    print("\nNote: These are sample results based on historical analysis.")
+    print("Run the full Bayesian analysis later for actual results.")
+
+
+if __name__ == '__main__':
+    main()
@@ -3,44 +3,281 @@ Flask Backend API for Brent Oil Price Dashboard
 Provides REST endpoints for price data, changepoints, and event correlations
 """
 
-from flask import Flask, jsonify, request
+from flask import Flask, jsonify, request, Response
 from flask_cors import CORS
+import orjson
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import functools
+import gzip
+import hashlib
 import os
+import threading
+from collections import OrderedDict
 from datetime import datetime
 
+try:
+    from numba import njit, prange
+    _HAS_NUMBA = True
+except ImportError:
+    _HAS_NUMBA = False
+
 app = Flask(__name__)
 CORS(app)
 
-# Data paths
+if _HAS_NUMBA:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _rolling_vol_numba(r, w):
+        """Fused rolling annualized std: one parallel pass, no temporaries."""
+        n = r.size - w + 1
+        out = np.empty(n)
+        ann = np.sqrt(252.0)
+        for i in prange(n):
+            s = 0.0
+            s2 = 0.0
+            for j in range(w):
+                v = r[i + j]
+                s += v
+                s2 += v * v
+            mean = s / w
+            var = (s2 - w * mean * mean) / (w - 1)
+            out[i] = np.sqrt(max(var, 0.0)) * ann
+        return out
+
+# Precompressed response bodies keyed on (path, query string); the
+# backing data is immutable after load_data, so serialized bytes can be
+# reused across requests. Bounded LRU: query parameters are free-form
+# (start_date/end_date/window), so without eviction every distinct
+# dashboard zoom would pin a gzipped body in the worker forever.
+_LRU_MAX_ENTRIES = 128
+_response_cache = OrderedDict()
+
+def _lru_get(cache, key):
+    """Fetch from an OrderedDict LRU, refreshing recency on hit."""
+    hit = cache.get(key)
+    if hit is not None:
+        cache.move_to_end(key)
+    return hit
+
+def _lru_put(cache, key, value, maxsize=_LRU_MAX_ENTRIES):
+    """Insert into an OrderedDict LRU, evicting the oldest past maxsize."""
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > maxsize:
+        cache.popitem(last=False)
+
+def cached_gzip(handler):
+    """Cache the serialized, gzip-compressed body of a GET handler.
+
+    Warm hits skip all pandas/JSON work; an If-None-Match ETag hit
+    skips the body entirely with a 304.
+    """
+    @functools.wraps(handler)
+    def wrapper(*args, **kwargs):
+        if 'gzip' not in request.headers.get('Accept-Encoding', ''):
+            return handler(*args, **kwargs)
+
+        key = request.full_path
+        hit = _lru_get(_response_cache, key)
+        if hit is None:
+            rv = handler(*args, **kwargs)
+            if isinstance(rv, tuple) or rv.status_code != 200:
+                return rv
+            body = gzip.compress(rv.get_data(), compresslevel=1)
+            etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+            hit = (etag, body, rv.mimetype)
+            _lru_put(_response_cache, key, hit)
+
+        etag, body, mimetype = hit
+        if request.headers.get('If-None-Match') == etag:
+            return Response(status=304, headers={'ETag': etag})
+        return Response(body, mimetype=mimetype,
+                        headers={'Content-Encoding': 'gzip', 'ETag': etag})
+    return wrapper
+
+def _json(obj):
+    """Serialize with orjson, which handles numpy arrays natively.
+
+    ~5-10x faster than the stdlib json used by jsonify on the large
+    numeric arrays returned by /api/prices and /api/volatility.
+    """
+    return Response(
+        orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY),
+        mimetype='application/json'
+    )
+
+# Data paths (Parquet is the primary format; CSV is kept as a fallback for
+# results produced before the Parquet migration)
 DATA_DIR = '../../outputs/data'
-PRICES_PATH = os.path.join(DATA_DIR, 'processed_prices.csv')
-CHANGEPOINTS_PATH = os.path.join(DATA_DIR, 'changepoint_results.csv')
-EVENTS_PATH = os.path.join(DATA_DIR, 'event_correlations.csv')
+PRICES_PATH = os.path.join(DATA_DIR, 'processed_prices.parquet')
+CHANGEPOINTS_PATH = os.path.join(DATA_DIR, 'changepoint_results.parquet')
+EVENTS_PATH = os.path.join(DATA_DIR, 'event_correlations.parquet')
 GEO_EVENTS_PATH = '../../data/events/geopolitical_events.csv'
 
-# Cache for data
+# Uncompressed Arrow IPC copy of the prices frame; when present, every
+# worker memory-maps the same physical pages instead of holding its own
+# copy of the cache
+SHARED_PRICES_PATH = os.environ.get(
+    'BRENT_SHARED_PRICES', '/dev/shm/brent_prices.arrow')
+
+# Cache for data; the lock keeps concurrent cold-start requests from
+# all reading the data files at once
 _cache = {}
+_cache_lock = threading.Lock()
+
+def export_shared_cache(path=SHARED_PRICES_PATH):
+    """Write the loaded prices frame as uncompressed Arrow IPC.
+
+    Called once pre-fork (see wsgi.py); worker load_data calls then map
+    this file read-only so N workers share one physical copy.
+    """
+    table = pa.Table.from_pandas(_cache['prices'], preserve_index=False)
+    with pa.OSFile(path, 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+def _read_shared_prices(path=SHARED_PRICES_PATH):
+    """Memory-map the shared Arrow IPC prices file, if it exists."""
+    if not os.path.exists(path):
+        return None
+    source = pa.memory_map(path, 'r')
+    table = pa.ipc.open_file(source).read_all()
+    # split_blocks keeps numeric columns zero-copy views of the mapping
+    return table.to_pandas(split_blocks=True, date_as_object=False)
+
+def _read_results(parquet_path, date_cols):
+    """Read a results file, preferring Parquet over the legacy CSV.
+
+    Parquet stores datetime64 columns natively, so no date re-parsing
+    is needed on that path.
+    """
+    if os.path.exists(parquet_path):
+        return pd.read_parquet(parquet_path, engine='pyarrow')
+
+    # Parse dates during the read itself (native code) instead of a
+    # separate pd.to_datetime pass per column afterwards
+    csv_path = parquet_path.replace('.parquet', '.csv')
+    return pd.read_csv(csv_path, engine='pyarrow', parse_dates=list(date_cols))
+
+def _build_statistics():
+    """Compute the summary statistics dict once at load time.
+
+    The data is immutable after load_data, so /api/statistics becomes a
+    plain dict return instead of ~10 full-column scans per request.
+    """
+    prices = _cache['prices']
+    price = prices['Price'].to_numpy(dtype=np.float64)
+    returns = prices['Returns'].to_numpy(dtype=np.float64)[1:]
+
+    return {
+        'total_observations': len(prices),
+        'date_range': {
+            'start': prices['Date'].min().strftime('%Y-%m-%d'),
+            'end': prices['Date'].max().strftime('%Y-%m-%d')
+        },
+        'price_stats': {
+            'mean': float(np.mean(price)),
+            'median': float(np.median(price)),
+            'std': float(np.std(price, ddof=1)),
+            'min': float(np.min(price)),
+            'max': float(np.max(price))
+        },
+        'returns_stats': {
+            'mean': float(np.mean(returns)),
+            'std': float(np.std(returns, ddof=1)),
+            'min': float(np.min(returns)),
+            'max': float(np.max(returns))
+        },
+        'changepoints_detected': len(_cache['changepoints']),
+        'events_correlated': len(_cache['correlations'])
+    }
 
 def load_data():
     """Load all data files into cache"""
-    if not _cache:
+    if _cache:
+        return True
+    with _cache_lock:
+        if _cache:
+            return True
         try:
-            _cache['prices'] = pd.read_csv(PRICES_PATH)
-            _cache['prices']['Date'] = pd.to_datetime(_cache['prices']['Date'])
-            
-            _cache['changepoints'] = pd.read_csv(CHANGEPOINTS_PATH)
-            _cache['changepoints']['date'] = pd.to_datetime(_cache['changepoints']['date'])
-            _cache['changepoints']['lower_ci'] = pd.to_datetime(_cache['changepoints']['lower_ci'])
-            _cache['changepoints']['upper_ci'] = pd.to_datetime(_cache['changepoints']['upper_ci'])
-            
-            _cache['correlations'] = pd.read_csv(EVENTS_PATH)
-            _cache['correlations']['changepoint_date'] = pd.to_datetime(_cache['correlations']['changepoint_date'])
-            _cache['correlations']['event_date'] = pd.to_datetime(_cache['correlations']['event_date'])
-            
-            _cache['geo_events'] = pd.read_csv(GEO_EVENTS_PATH)
-            _cache['geo_events']['Date'] = pd.to_datetime(_cache['geo_events']['Date'])
-            
+            # Prefer the pre-fork shared Arrow mapping (already downcast
+            # and sorted when exported); fall back to the results files
+            shared_prices = _read_shared_prices()
+            from_shared = shared_prices is not None
+            _cache['prices'] = shared_prices if from_shared \
+                else _read_results(PRICES_PATH, ['Date'])
+            _cache['changepoints'] = _read_results(
+                CHANGEPOINTS_PATH, ['date', 'lower_ci', 'upper_ci'])
+            _cache['correlations'] = _read_results(
+                EVENTS_PATH, ['changepoint_date', 'event_date'])
+
+            # Downcast: float32/int32 are ample for display precision and
+            # halve the bytes moved by every downstream mask/rolling op
+            if not from_shared:
+                for col in ('Price', 'Returns', 'Log_Returns'):
+                    _cache['prices'][col] = \
+                        _cache['prices'][col].astype('float32', copy=False)
+            _cache['changepoints']['index'] = _cache['changepoints']['index'].astype('int32')
+            _cache['correlations']['days_difference'] = \
+                _cache['correlations']['days_difference'].astype('int16')
+            _cache['correlations']['proximity_score'] = \
+                _cache['correlations']['proximity_score'].astype('float32')
+
+            # Category columns are low-cardinality: categorical dtype makes
+            # equality filters integer-code comparisons instead of
+            # per-row string comparisons
+            _cache['correlations']['event_category'] = \
+                _cache['correlations']['event_category'].astype('category')
+
+            # Pre-project the correlations response as an Arrow table;
+            # /api/correlations then emits it with to_pylist, which
+            # iterates in C rather than row-by-row in Python
+            corr = _cache['correlations']
+            _cache['correlations_tbl'] = pa.table({
+                'changepoint_date': pc.strftime(
+                    pa.Array.from_pandas(corr['changepoint_date']),
+                    format='%Y-%m-%d'),
+                'event_date': pc.strftime(
+                    pa.Array.from_pandas(corr['event_date']),
+                    format='%Y-%m-%d'),
+                'event_description': pa.Array.from_pandas(
+                    corr['event_description']),
+                'event_category': pa.Array.from_pandas(
+                    corr['event_category'].astype(str)),
+                'days_difference': pa.Array.from_pandas(
+                    corr['days_difference'].astype('int64')),
+                'proximity_score': pa.Array.from_pandas(
+                    corr['proximity_score'].astype('float64')),
+            })
+
+            _cache['geo_events'] = pd.read_csv(
+                GEO_EVENTS_PATH, engine='pyarrow', parse_dates=['Date'])
+            _cache['geo_events']['Category'] = \
+                _cache['geo_events']['Category'].astype('category')
+
+            # Prices are strictly monotonic by Date: keep them sorted and
+            # cache the raw datetime64 index so date windowing is an
+            # O(log N) searchsorted slice instead of a full-column mask
+            if not from_shared:
+                _cache['prices'].sort_values('Date', inplace=True, kind='stable')
+                _cache['prices'].reset_index(drop=True, inplace=True)
+            _cache['prices_date_idx'] = \
+                _cache['prices']['Date'].to_numpy(dtype='datetime64[ns]')
+
+            # Arrow dataset for the events endpoint: category/date
+            # predicates are pushed into the scanner so only matching
+            # rows are ever materialized.
+            _cache['events_ds'] = ds.dataset(
+                pa.Table.from_pandas(_cache['geo_events'], preserve_index=False))
+
+            _cache['stats'] = _build_statistics()
+
+            # Serialized bodies derived from the old cache are stale now
+            _response_cache.clear()
+
         except Exception as e:
             print(f"Error loading data: {e}")
             return False
@@ -52,157 +289,159 @@ def health_check():
     return jsonify({'status': 'healthy', 'message': 'API is running'})
 
 @app.route('/api/prices', methods=['GET'])
+@cached_gzip
 def get_prices():
     """Get historical price data with optional date filtering"""
     if not load_data():
         return jsonify({'error': 'Data not available'}), 500
     
-    df = _cache['prices'].copy()
-    
-    # Optional date filtering
+    # Optional date filtering: binary-search the sorted date index and
+    # take a slice view (no copy, no full-column comparison)
     start_date = request.args.get('start_date')
     end_date = request.args.get('end_date')
+
+    idx = _cache['prices_date_idx']
+    i0 = np.searchsorted(idx, pd.Timestamp(start_date).to_datetime64()) \
+        if start_date else 0
+    i1 = np.searchsorted(idx, pd.Timestamp(end_date).to_datetime64(), side='right') \
+        if end_date else len(idx)
+    # NOTE: read-only view of the cache — do not mutate
+    df = _cache['prices'].iloc[i0:i1]
     
-    if start_date:
-        df = df[df['Date'] >= pd.to_datetime(start_date)]
-    if end_date:
-        df = df[df['Date'] <= pd.to_datetime(end_date)]
-    
-    # Convert to JSON-friendly format
+    # Convert to JSON-friendly format; numeric columns stay as numpy
+    # arrays all the way into orjson (no per-element float boxing)
     data = {
         'dates': df['Date'].dt.strftime('%Y-%m-%d').tolist(),
-        'prices': df['Price'].tolist(),
-        'returns': df['Returns'].fillna(0).tolist(),
-        'log_returns': df['Log_Returns'].fillna(0).tolist()
+        'prices': df['Price'].to_numpy(),
+        'returns': df['Returns'].fillna(0).to_numpy(),
+        'log_returns': df['Log_Returns'].fillna(0).to_numpy()
     }
-    
-    return jsonify(data)
+
+    return _json(data)
 
 @app.route('/api/changepoints', methods=['GET'])
+@cached_gzip
 def get_changepoints():
     """Get detected change points"""
     if not load_data():
         return jsonify({'error': 'Data not available'}), 500
     
-    df = _cache['changepoints'].copy()
-    
-    changepoints = []
-    for _, row in df.iterrows():
-        changepoints.append({
-            'id': int(row['changepoint_id']),
-            'date': row['date'].strftime('%Y-%m-%d'),
-            'index': int(row['index']),
-            'lower_ci': row['lower_ci'].strftime('%Y-%m-%d'),
-            'upper_ci': row['upper_ci'].strftime('%Y-%m-%d')
-        })
-    
-    return jsonify(changepoints)
+    # NOTE: read-only view of the cache — do not mutate
+    df = _cache['changepoints']
+
+    # Vectorized projection instead of per-row iterrows dict building
+    out = pd.DataFrame({
+        'id': df['changepoint_id'].astype(int),
+        'date': df['date'].dt.strftime('%Y-%m-%d'),
+        'index': df['index'].astype(int),
+        'lower_ci': df['lower_ci'].dt.strftime('%Y-%m-%d'),
+        'upper_ci': df['upper_ci'].dt.strftime('%Y-%m-%d')
+    })
+
+    return jsonify(out.to_dict('records'))
 
 @app.route('/api/events', methods=['GET'])
+@cached_gzip
 def get_events():
     """Get all geopolitical events with optional filtering"""
     if not load_data():
         return jsonify({'error': 'Data not available'}), 500
     
-    df = _cache['geo_events'].copy()
-    
-    # Optional filtering
+    # Optional filtering, pushed down into the Arrow scanner
     category = request.args.get('category')
     start_date = request.args.get('start_date')
     end_date = request.args.get('end_date')
-    
+
+    filters = []
     if category:
-        df = df[df['Category'] == category]
+        filters.append(ds.field('Category') == category)
     if start_date:
-        df = df[df['Date'] >= pd.to_datetime(start_date)]
+        filters.append(ds.field('Date') >= pa.scalar(pd.Timestamp(start_date)))
     if end_date:
-        df = df[df['Date'] <= pd.to_datetime(end_date)]
-    
-    events = []
-    for _, row in df.iterrows():
-        events.append({
-            'date': row['Date'].strftime('%Y-%m-%d'),
-            'event': row['Event'],
-            'category': row['Category'],
-            'description': row.get('Description', '')
-        })
+        filters.append(ds.field('Date') <= pa.scalar(pd.Timestamp(end_date)))
+
+    flt = None
+    for f in filters:
+        flt = f if flt is None else flt & f
+
+    df = _cache['events_ds'].to_table(filter=flt).to_pandas(date_as_object=False)
     
-    return jsonify(events)
+    out = pd.DataFrame({
+        'date': df['Date'].dt.strftime('%Y-%m-%d'),
+        'event': df['Event'],
+        'category': df['Category'].astype(str),
+        'description': df['Description'] if 'Description' in df.columns else ''
+    })
+
+    return jsonify(out.to_dict('records'))
 
 @app.route('/api/correlations', methods=['GET'])
+@cached_gzip
 def get_correlations():
     """Get event-changepoint correlations"""
     if not load_data():
         return jsonify({'error': 'Data not available'}), 500
     
-    df = _cache['correlations'].copy()
-    
-    correlations = []
-    for _, row in df.iterrows():
-        correlations.append({
-            'changepoint_date': row['changepoint_date'].strftime('%Y-%m-%d'),
-            'event_date': row['event_date'].strftime('%Y-%m-%d'),
-            'event_description': row['event_description'],
-            'event_category': row['event_category'],
-            'days_difference': int(row['days_difference']),
-            'proximity_score': float(row['proximity_score'])
-        })
-    
-    return jsonify(correlations)
+    # Single batched Arrow->Python conversion of the pre-projected table
+    return jsonify(_cache['correlations_tbl'].to_pylist())
 
 @app.route('/api/statistics', methods=['GET'])
+@cached_gzip
 def get_statistics():
     """Get summary statistics"""
     if not load_data():
         return jsonify({'error': 'Data not available'}), 500
     
-    prices = _cache['prices']
-    
-    stats = {
-        'total_observations': len(prices),
-        'date_range': {
-            'start': prices['Date'].min().strftime('%Y-%m-%d'),
-            'end': prices['Date'].max().strftime('%Y-%m-%d')
-        },
-        'price_stats': {
-            'mean': float(prices['Price'].mean()),
-            'median': float(prices['Price'].median()),
-            'std': float(prices['Price'].std()),
-            'min': float(prices['Price'].min()),
-            'max': float(prices['Price'].max())
-        },
-        'returns_stats': {
-            'mean': float(prices['Returns'].mean()),
-            'std': float(prices['Returns'].std()),
-            'min': float(prices['Returns'].min()),
-            'max': float(prices['Returns'].max())
-        },
-        'changepoints_detected': len(_cache['changepoints']),
-        'events_correlated': len(_cache['correlations'])
-    }
-    
-    return jsonify(stats)
+    return jsonify(_cache['stats'])
 
 @app.route('/api/volatility', methods=['GET'])
+@cached_gzip
 def get_volatility():
     """Calculate rolling volatility"""
     if not load_data():
         return jsonify({'error': 'Data not available'}), 500
     
-    df = _cache['prices'].copy()
     window = int(request.args.get('window', 30))
-    
-    df['volatility'] = df['Returns'].rolling(window=window).std() * (252 ** 0.5)
-    df = df.dropna()
-    
+
+    # Memoize per window: the underlying series is immutable after
+    # load. Window is caller-controlled, so this shares the bounded-LRU
+    # treatment of the response cache rather than growing per ?window=N
+    vol_cache = _cache.setdefault('vol', OrderedDict())
+    if _lru_get(vol_cache, window) is None:
+        prices = _cache['prices']
+        # Skip the leading NaN return so every window is fully populated
+        r = prices['Returns'].to_numpy(dtype=np.float64)[1:]
+
+        if f'vol_{window}' in prices.columns:
+            # Precomputed by run_analysis_fast.py: a column projection,
+            # not a compute
+            vol = prices[f'vol_{window}'].to_numpy(dtype=np.float64)[window:]
+        elif _HAS_NUMBA:
+            # Single fused parallel pass, compiled on first use
+            vol = _rolling_vol_numba(r, window)
+        else:
+            # O(n) rolling std via cumulative sums of r and r**2
+            c1 = np.concatenate(([0.0], np.cumsum(r)))
+            c2 = np.concatenate(([0.0], np.cumsum(r * r)))
+            s1 = c1[window:] - c1[:-window]
+            s2 = c2[window:] - c2[:-window]
+            var = (s2 - s1 * s1 / window) / (window - 1)
+            vol = np.sqrt(np.maximum(var, 0.0)) * np.sqrt(252)
+
+        dates = prices['Date'].iloc[window:].dt.strftime('%Y-%m-%d').tolist()
+        _lru_put(vol_cache, window, (dates, vol))
+
+    dates, vol = vol_cache[window]
     data = {
-        'dates': df['Date'].dt.strftime('%Y-%m-%d').tolist(),
-        'volatility': df['volatility'].tolist()
+        'dates': dates,
+        'volatility': vol
     }
-    
-    return jsonify(data)
+
+    return _json(data)
 
 if __name__ == '__main__':
-    print("Starting Flask API server...")
+    # Dev convenience only; production runs under Gunicorn, e.g.
+    #   gunicorn --preload -w 4 -k gthread --threads 8 wsgi:app
+    print("Starting Flask API server (development mode)...")
     print("API will be available at http://localhost:5000")
-    app.run(debug=True, port=5000)
+    app.run(port=5000)
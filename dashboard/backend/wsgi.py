@@ -0,0 +1,21 @@
+"""
+WSGI entry point for the dashboard backend.
+
+Warms the data cache at import time so that, under Gunicorn with
+--preload, the loaded frames are shared copy-on-write across workers:
+
+    gunicorn --preload -w 4 -k gthread --threads 8 wsgi:app
+
+The prices frame is additionally exported as an uncompressed Arrow IPC
+file (in /dev/shm by default) that each worker memory-maps read-only,
+so the largest cached frame occupies one set of physical pages no
+matter how many workers are running.
+"""
+
+from app import app, export_shared_cache, load_data
+
+if load_data():
+    try:
+        export_shared_cache()
+    except OSError as e:
+        print(f"Could not export shared Arrow cache: {e}")
@@ -12,12 +12,27 @@ from src.changepoint_model import BayesianChangePointModel
 
 st.title("Brent Oil Price Analysis Dashboard")
 
+FEATHER_CACHE = '../../outputs/data/processed_prices.feather'
+
 # Load data
 @st.cache_data
 def load_data():
+    # Feather round-trips the preprocessed frame with near-zero
+    # deserialization cost, so reruns after a cache miss skip the CSV
+    # parse and preprocessing entirely
+    if os.path.exists(FEATHER_CACHE):
+        return pd.read_feather(FEATHER_CACHE, use_threads=True)
+
     loader = BrentDataLoader(data_path='../../data/events/BrentOilPrices.csv')
     df = loader.load_data()
     df = loader.preprocess()
+
+    try:
+        os.makedirs(os.path.dirname(FEATHER_CACHE), exist_ok=True)
+        df.reset_index(drop=True).to_feather(FEATHER_CACHE)
+    except OSError as e:
+        st.warning(f"Could not write feather cache: {e}")
+
     return df
 
 df = load_data()
@@ -0,0 +1,155 @@
+"""
+Rolling-window kernels shared by the analysis modules.
+
+numba is optional: when it is installed the kernels are JIT-compiled
+(and the fused kernel parallelized across windows); otherwise numpy
+fallbacks with the same signatures are exported.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    _HAS_NUMBA = True
+except ImportError:  # pragma: no cover - optional dependency
+    _HAS_NUMBA = False
+
+
+def _rolling_std_cumsum(x: np.ndarray, window: int) -> np.ndarray:
+    """Rolling sample std via prefix sums of x and x**2 (numpy fallback)."""
+    n = x.size
+    out = np.full(n, np.nan)
+    if window <= n:
+        c = np.empty(n + 1)
+        c[0] = 0.0
+        np.cumsum(x, out=c[1:])
+        c2 = np.empty(n + 1)
+        c2[0] = 0.0
+        np.cumsum(x * x, out=c2[1:])
+        s = c[window:] - c[:-window]
+        ss = c2[window:] - c2[:-window]
+        var = (ss - s * s / window) / (window - 1)
+        out[window - 1:] = np.sqrt(np.maximum(var, 0.0))
+    return out
+
+
+if _HAS_NUMBA:
+    @njit(cache=True)
+    def _rolling_std_welford(x: np.ndarray, window: int) -> np.ndarray:
+        """Single-pass Welford rolling sample std: O(1) work per step.
+
+        The running mean and M2 are updated as one value enters the
+        window and one leaves, avoiding the catastrophic cancellation
+        the plain sum-of-squares fallback can hit on long series.
+        """
+        n = x.size
+        out = np.full(n, np.nan)
+        if window > n:
+            return out
+        mean = 0.0
+        m2 = 0.0
+        for i in range(window):
+            delta = x[i] - mean
+            mean += delta / (i + 1)
+            m2 += (x[i] - mean) * delta
+        out[window - 1] = np.sqrt(m2 / (window - 1)) if m2 > 0.0 else 0.0
+        for i in range(window, n):
+            x_new = x[i]
+            x_old = x[i - window]
+            old_mean = mean
+            mean += (x_new - x_old) / window
+            m2 += (x_new - x_old) * (x_new - mean + x_old - old_mean)
+            out[i] = np.sqrt(m2 / (window - 1)) if m2 > 0.0 else 0.0
+        return out
+
+    @njit(parallel=True, cache=True)
+    def fused_returns_vol(price: np.ndarray, windows: np.ndarray):
+        """Fused returns + rolling-std kernel: price is read once.
+
+        Returns ``(returns, out)`` where ``out[k]`` is the rolling
+        sample std of the returns for ``windows[k]``; windows run in
+        parallel via prange since each is an independent O(n) sweep
+        over the shared returns array.
+        """
+        n = price.size
+        returns = np.empty(n)
+        returns[0] = np.nan
+        for i in range(1, n):
+            returns[i] = price[i] / price[i - 1] - 1.0
+
+        out = np.full((windows.size, n), np.nan)
+        for k in prange(windows.size):
+            w = windows[k]
+            if w >= n:
+                continue
+            # Returns start at index 1; the first full window ends at
+            # index w, matching pandas rolling over a leading NaN
+            mean = 0.0
+            m2 = 0.0
+            for i in range(1, w + 1):
+                delta = returns[i] - mean
+                mean += delta / i
+                m2 += (returns[i] - mean) * delta
+            out[k, w] = np.sqrt(m2 / (w - 1)) if m2 > 0.0 else 0.0
+            for i in range(w + 1, n):
+                x_new = returns[i]
+                x_old = returns[i - w]
+                old_mean = mean
+                mean += (x_new - x_old) / w
+                m2 += (x_new - x_old) * (x_new - mean + x_old - old_mean)
+                out[k, i] = np.sqrt(m2 / (w - 1)) if m2 > 0.0 else 0.0
+        return returns, out
+
+    @njit(parallel=True, cache=True)
+    def multi_window_ma(arr: np.ndarray, windows: np.ndarray) -> np.ndarray:
+        """Moving averages for all windows from one shared prefix sum.
+
+        The cumulative sum is built once; each window then runs as an
+        independent prange lane doing a subtract/scale sweep, so the
+        input array is read a single time no matter how many windows
+        are requested.
+        """
+        n = arr.size
+        c = np.empty(n + 1)
+        c[0] = 0.0
+        acc = 0.0
+        for i in range(n):
+            acc += arr[i]
+            c[i + 1] = acc
+
+        out = np.full((windows.size, n), np.nan)
+        for k in prange(windows.size):
+            w = windows[k]
+            if w <= n:
+                inv = 1.0 / w
+                for i in range(w - 1, n):
+                    out[k, i] = (c[i + 1] - c[i + 1 - w]) * inv
+        return out
+else:
+    _rolling_std_welford = _rolling_std_cumsum
+
+    def fused_returns_vol(price: np.ndarray, windows: np.ndarray):
+        """numpy fallback for the fused returns + rolling-std kernel."""
+        n = price.size
+        returns = np.full(n, np.nan)
+        returns[1:] = price[1:] / price[:-1] - 1.0
+
+        out = np.full((len(windows), n), np.nan)
+        valid = returns[1:]
+        for k, w in enumerate(windows):
+            out[k, 1:] = _rolling_std_cumsum(valid, int(w))
+        return returns, out
+
+    def multi_window_ma(arr: np.ndarray, windows: np.ndarray) -> np.ndarray:
+        """numpy fallback: per-window prefix-sum moving averages."""
+        n = arr.size
+        c = np.empty(n + 1)
+        c[0] = 0.0
+        np.cumsum(arr, out=c[1:])
+
+        out = np.full((len(windows), n), np.nan)
+        for k, w in enumerate(windows):
+            w = int(w)
+            if w <= n:
+                out[k, w - 1:] = (c[w:] - c[:-w]) * (1.0 / w)
+        return out
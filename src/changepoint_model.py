@@ -2,6 +2,9 @@
 Bayesian change point detection for Brent oil prices.
 """
 
+import heapq
+import sys
+from contextlib import nullcontext
 from dataclasses import dataclass
 from typing import Optional, Tuple
 
@@ -12,13 +15,73 @@ import arviz as az
 import matplotlib.pyplot as plt
 import pytensor.tensor as pt
 
+try:
+    from numba import njit
+    _HAS_NUMBA = True
+except ImportError:
+    _HAS_NUMBA = False
+
+try:
+    from threadpoolctl import threadpool_limits
+except ImportError:
+    threadpool_limits = None
+
 
 @dataclass
 class ChangePointResult:
     """Dataclass for change point results."""
     changepoints: np.ndarray
     means: np.ndarray
-    trace: az.InferenceData
+    trace: Optional[az.InferenceData]
+
+
+def _best_split_numpy(S: np.ndarray, S2: np.ndarray, s: int, t: int) -> Tuple[int, float]:
+    """
+    Find the single split of segment [s, t) with the largest likelihood gain.
+
+    Uses the Gaussian cost (up to constants)
+        cost(s, t) = (S2[t] - S2[s]) - (S[t] - S[s])**2 / (t - s)
+    which the prefix sums S and S2 make O(1) per evaluation, so the scan
+    over candidate splits is a single vectorized pass.
+
+    Returns:
+    --------
+    tuple : (tau, gain), or (-1, 0.0) when the segment cannot be split
+    """
+    if t - s < 2:
+        return -1, 0.0
+
+    taus = np.arange(s + 1, t)
+    full = (S2[t] - S2[s]) - (S[t] - S[s]) ** 2 / (t - s)
+    left = (S2[taus] - S2[s]) - (S[taus] - S[s]) ** 2 / (taus - s)
+    right = (S2[t] - S2[taus]) - (S[t] - S[taus]) ** 2 / (t - taus)
+    gains = full - left - right
+
+    k = int(np.argmax(gains))
+    return int(taus[k]), float(gains[k])
+
+
+if _HAS_NUMBA:
+    # JIT-compiled variant of _best_split_numpy: a single scalar loop
+    # with no temporary arrays, compiled once and cached on disk
+    @njit(cache=True, fastmath=True, boundscheck=False)
+    def _best_split(S, S2, s, t):
+        if t - s < 2:
+            return -1, 0.0
+
+        full = (S2[t] - S2[s]) - (S[t] - S[s]) ** 2 / (t - s)
+        best_tau = -1
+        best_gain = -np.inf
+        for tau in range(s + 1, t):
+            left = (S2[tau] - S2[s]) - (S[tau] - S[s]) ** 2 / (tau - s)
+            right = (S2[t] - S2[tau]) - (S[t] - S[tau]) ** 2 / (t - tau)
+            gain = full - left - right
+            if gain > best_gain:
+                best_gain = gain
+                best_tau = tau
+        return best_tau, best_gain
+else:
+    _best_split = _best_split_numpy
 
 
 class BayesianChangePointModel:
@@ -38,14 +101,38 @@ class BayesianChangePointModel:
         self.n_changepoints: int = n_changepoints
         self.model: Optional[pm.Model] = None
         self.trace: Optional[az.InferenceData] = None
+        self.binseg_result: Optional[ChangePointResult] = None
 
     def build_model(self) -> pm.Model:
-        """Build the Bayesian change point model."""
+        """Build the Bayesian change point model.
+
+        The Gaussian likelihood is expressed through prefix sums of the
+        data and its square: segment sufficient statistics are O(1)
+        lookups at the tau boundaries, so each logp evaluation is
+        O(n_changepoints) graph work instead of an n-length
+        segment-assignment gather.
+        """
         data = self.data
         n = self.n
         n_cp = self.n_changepoints
-        
+
+        # Prefix sums with a leading zero so segment [b, e) statistics
+        # are S[e] - S[b]
+        prefix_sum = np.concatenate(([0.0], np.cumsum(data)))
+        prefix_sumsq = np.concatenate(([0.0], np.cumsum(data ** 2)))
+
+        # Hoist the prior hyperparameters: each .mean()/.std() call is a
+        # full scan of the data, and std was being computed twice
+        data_mean = data.mean()
+        data_std = data.std()
+
+        # Constant tensors, not model data containers: pm.ConstantData
+        # is gone from recent PyMC releases
+        S = pt.as_tensor_variable(prefix_sum)
+        S2 = pt.as_tensor_variable(prefix_sumsq)
+
         with pm.Model() as model:
+
             # Priors for change point locations
             tau = pm.DiscreteUniform(
                 "tau",
@@ -53,43 +140,101 @@ class BayesianChangePointModel:
                 upper=n-1,
                 shape=n_cp
             )
-            
+
             # Sort change points to ensure ordering using pytensor
             tau_sorted = pt.sort(tau)
-            
+
             # Priors for segment means
             mu = pm.Normal(
                 "mu",
-                mu=data.mean(),
-                sigma=2 * data.std(),
+                mu=data_mean,
+                sigma=2 * data_std,
                 shape=n_cp + 1
             )
-            
+
             # Prior for observation noise
-            sigma = pm.HalfNormal("sigma", sigma=data.std())
-            
-            # Assign each observation to a segment
-            idx = np.arange(n)
-            segment = pm.math.sum(
-                [idx >= tau_sorted[i] for i in range(n_cp)],
-                axis=0
+            sigma = pm.HalfNormal("sigma", sigma=data_std)
+
+            # Segment bounds [0, tau_1, ..., tau_k, n] and sufficient
+            # statistics per segment via prefix-sum differences
+            bounds = pt.concatenate([
+                pt.zeros(1, dtype='int64'),
+                tau_sorted,
+                pt.full((1,), n, dtype='int64')
+            ])
+            seg_len = bounds[1:] - bounds[:-1]
+            seg_sum = pt.take(S, bounds[1:]) - pt.take(S, bounds[:-1])
+            seg_sumsq = pt.take(S2, bounds[1:]) - pt.take(S2, bounds[:-1])
+
+            # Gaussian log-likelihood of each segment at its mean
+            seg_loglik = (
+                -0.5 * seg_len * pt.log(2 * np.pi * sigma ** 2)
+                - (seg_sumsq - 2 * mu * seg_sum + seg_len * mu ** 2)
+                / (2 * sigma ** 2)
             )
-            
-            # Likelihood
-            pm.Normal(
-                "obs",
-                mu=mu[segment],
-                sigma=sigma,
-                observed=data
+            pm.Potential("obs", seg_loglik.sum())
+
+        self.model = model
+        return model
+
+    def build_marginalized_model(self) -> pm.Model:
+        """
+        Build a model with the discrete change point marginalized out.
+
+        Summing the likelihood over every candidate tau (a logsumexp
+        with a uniform prior over splits) leaves only the continuous mu
+        and sigma, so NUTS handles the whole posterior and the JAX
+        backend becomes usable. Segment statistics are read from
+        cumulative sums of the data and its square, making each
+        candidate tau O(1) rather than O(n).
+
+        Currently implemented for n_changepoints=1.
+        """
+        if self.n_changepoints != 1:
+            raise NotImplementedError(
+                "Marginalized model currently supports n_changepoints=1")
+
+        data = self.data
+        n = self.n
+        mu_prior = data.mean()
+        sd_prior = data.std()
+
+        # Sufficient statistics for the left segment [0, tau) at every
+        # candidate split tau = 1..n-1; the right segment is the
+        # complement against the totals
+        cy = np.cumsum(data)
+        cy2 = np.cumsum(data ** 2)
+
+        s1_left = pt.as_tensor_variable(cy[:-1])
+        s2_left = pt.as_tensor_variable(cy2[:-1])
+        n_left = pt.arange(1, n)
+
+        with pm.Model() as model:
+            mu = pm.Normal("mu", mu=mu_prior, sigma=2 * sd_prior, shape=2)
+            sigma = pm.HalfNormal("sigma", sigma=sd_prior)
+
+            def segment_loglik(s1, s2, count, m):
+                return (
+                    -0.5 * count * pt.log(2 * np.pi * sigma ** 2)
+                    - (s2 - 2 * m * s1 + count * m ** 2) / (2 * sigma ** 2)
+                )
+
+            loglik_per_tau = (
+                segment_loglik(s1_left, s2_left, n_left, mu[0])
+                + segment_loglik(cy[-1] - s1_left, cy2[-1] - s2_left,
+                                 n - n_left, mu[1])
             )
-        
+
+            # Uniform prior over split locations
+            pm.Potential("obs", pt.logsumexp(loglik_per_tau) - pt.log(n - 1))
+
         self.model = model
         return model
 
-    def fit(self, draws: int = 2000, tune: int = 1000, chains: int = 2, cores: int = 1, random_seed: Optional[int] = None) -> az.InferenceData:
+    def fit(self, draws: int = 2000, tune: int = 1000, chains: int = 2, cores: Optional[int] = None, random_seed: Optional[int] = None, backend: str = "C") -> az.InferenceData:
         """
         Fit the model using MCMC sampling.
-        
+
         Parameters:
         -----------
         draws : int
@@ -98,27 +243,115 @@ class BayesianChangePointModel:
             Number of tuning steps
         chains : int
             Number of MCMC chains
-        cores : int
-            Number of CPU cores to use
+        cores : int, optional
+            Number of CPU cores to use; defaults to one per chain.
+            Values above the chain count buy nothing.
         random_seed : int
             Random seed for reproducibility
+        backend : str
+            Likelihood compilation backend: "C" (default), "NUMBA", or
+            "JAX". "NUMBA" compiles the log-prob with Numba instead of
+            the C toolchain (typically ~2x faster, no compiler needed).
+            "JAX" samples with NumPyro NUTS, which has no discrete
+            gradients — it requires tau to be marginalized out, so with
+            the DiscreteUniform formulation use "NUMBA" instead.
         """
         if self.model is None:
             raise ValueError("Model not built. Call build_model() first.")
-        
-        with self.model:
-            self.trace = pm.sample(
-                draws=draws,
-                tune=tune,
-                chains=chains,
-                cores=cores,
-                random_seed=random_seed,
-                return_inferencedata=True,
-                progressbar=True
-            )
-        
+
+        cores = cores or chains
+
+        # Pin BLAS to one thread per chain process; otherwise each of
+        # the N chains spawns its own BLAS pool and parallel sampling
+        # ends up slower than serial
+        blas_limit = (threadpool_limits(limits=1, user_api='blas')
+                      if threadpool_limits is not None else nullcontext())
+
+        with blas_limit, self.model:
+            if backend == "JAX":
+                from pymc.sampling.jax import sample_numpyro_nuts
+                self.trace = sample_numpyro_nuts(
+                    draws=draws,
+                    tune=tune,
+                    chains=chains,
+                    random_seed=random_seed
+                )
+            else:
+                compile_kwargs = {"mode": "NUMBA"} if backend == "NUMBA" else None
+                self.trace = pm.sample(
+                    draws=draws,
+                    tune=tune,
+                    chains=chains,
+                    cores=cores,
+                    random_seed=random_seed,
+                    return_inferencedata=True,
+                    progressbar=True,
+                    compile_kwargs=compile_kwargs,
+                    mp_ctx='fork' if sys.platform != 'win32' else 'spawn'
+                )
+
         return self.trace
 
+    def fit_binseg(self, n_changepoints: Optional[int] = None, penalty: Optional[float] = None) -> ChangePointResult:
+        """
+        Detect change points with Binary Segmentation instead of MCMC.
+
+        Recursively splits the segment whose best split yields the
+        largest Gaussian-likelihood gain, stopping when the gain drops
+        below the penalty or the requested number of change points is
+        reached. O(n log n) float work instead of thousands of MCMC
+        graph evaluations — orders of magnitude faster, with comparable
+        locations for well-separated regimes.
+
+        Parameters:
+        -----------
+        n_changepoints : int, optional
+            Maximum number of change points (defaults to the value
+            passed at construction)
+        penalty : float, optional
+            Minimum likelihood gain for a split to be accepted
+            (defaults to a BIC-style 2 * var(data) * log(n))
+        """
+        data = self.data.astype(np.float64, copy=False)
+        n = self.n
+        if n_changepoints is None:
+            n_changepoints = self.n_changepoints
+        if penalty is None:
+            penalty = 2.0 * np.var(data) * np.log(n)
+
+        # Prefix sums make every segment cost O(1)
+        S = np.concatenate(([0.0], np.cumsum(data)))
+        S2 = np.concatenate(([0.0], np.cumsum(data * data)))
+
+        # Max-heap of candidate splits, keyed on likelihood gain
+        heap: list = []
+
+        def push(s: int, t: int) -> None:
+            tau, gain = _best_split(S, S2, s, t)
+            if tau >= 0:
+                heapq.heappush(heap, (-gain, s, t, tau))
+
+        changepoints: list = []
+        push(0, n)
+        while heap and len(changepoints) < n_changepoints:
+            neg_gain, s, t, tau = heapq.heappop(heap)
+            if -neg_gain < penalty:
+                break
+            changepoints.append(tau)
+            push(s, tau)
+            push(tau, t)
+
+        cps = np.sort(np.asarray(changepoints, dtype=np.int64))
+        bounds = np.concatenate(([0], cps, [n]))
+        means = (S[bounds[1:]] - S[bounds[:-1]]) / (bounds[1:] - bounds[:-1])
+
+        self.binseg_result = ChangePointResult(
+            changepoints=cps,
+            means=means,
+            trace=None
+        )
+        return self.binseg_result
+
     def get_changepoint_summary(self) -> pd.DataFrame:
         """Get summary statistics for the posterior."""
         if self.trace is None:
@@ -153,14 +386,14 @@ class BayesianChangePointModel:
         if self.trace is None:
             raise ValueError("Model not fitted yet.")
         
-        # Extract posterior samples
-        tau_samples = self.trace.posterior['tau'].values
-        tau_samples = tau_samples.reshape(-1, self.n_changepoints)
-        tau_mean = tau_samples.mean(axis=0).astype(int)
-        
-        mu_samples = self.trace.posterior['mu'].values
-        mu_samples = mu_samples.reshape(-1, self.n_changepoints + 1)
-        mu_mean = mu_samples.mean(axis=0)
+        # Posterior summaries straight from xarray — no dense
+        # (chains*draws, k) reshape copies
+        posterior = self.trace.posterior
+        tau_mean = posterior['tau'].mean(dim=('chain', 'draw')).values.astype(int)
+        mu_mean = posterior['mu'].mean(dim=('chain', 'draw')).values
+
+        # Flattened draws for the histograms; stack returns a view
+        tau_samples = posterior['tau'].stack(sample=('chain', 'draw')).values
         
         # Create figure
         fig, axes = plt.subplots(2, 1, figsize=figsize, sharex=True)
@@ -204,7 +437,7 @@ class BayesianChangePointModel:
         # Plot 2: Change point posterior distributions
         ax = axes[1]
         for i in range(self.n_changepoints):
-            ax.hist(tau_samples[:, i], bins=50, alpha=0.6,
+            ax.hist(tau_samples[i], bins=50, alpha=0.6,
                    label=f'Change Point {i+1}')
         
         ax.set_xlabel('Time Index' if dates is None else 'Date')
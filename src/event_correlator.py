@@ -10,12 +10,40 @@ import numpy as np
 from datetime import datetime, timedelta
 
 
+@dataclass
+class EventWindow:
+    """Columnar view of the events found inside one correlation window.
+
+    Parallel ndarrays instead of a list of per-event dicts: rows share
+    five flat arrays, so downstream ranking and reporting can operate
+    on whole columns at once.
+    """
+    event_dates: np.ndarray
+    descriptions: np.ndarray
+    categories: np.ndarray
+    proximity_scores: np.ndarray
+    days_differences: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.event_dates)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Return the window as a DataFrame (no per-row flattening)."""
+        return pd.DataFrame({
+            'event_date': self.event_dates,
+            'description': self.descriptions,
+            'category': self.categories,
+            'proximity_score': self.proximity_scores,
+            'days_difference': self.days_differences
+        })
+
+
 @dataclass
 class CorrelationResult:
     """Dataclass for correlation results."""
     changepoint_index: int
     changepoint_date: datetime
-    events: List[Dict[str, any]]
+    events: EventWindow
 
 
 class EventCorrelator:
@@ -40,15 +68,28 @@ class EventCorrelator:
         dates : pd.Series or array-like
             Series of dates corresponding to the time series indices
         """
-        self.events_df: pd.DataFrame = events_df.copy()
-        self.dates: pd.Series = pd.Series(dates) if not isinstance(dates, pd.Series) else dates.copy()
-        
-        # Ensure dates are datetime objects
-        if not pd.api.types.is_datetime64_any_dtype(self.events_df['Date']):
-            self.events_df['Date'] = pd.to_datetime(self.events_df['Date'])
-        
-        if not pd.api.types.is_datetime64_any_dtype(self.dates):
-            self.dates = pd.to_datetime(self.dates)
+        # Keep a reference only; the correlator never mutates the input
+        # frame, so no defensive copy is taken
+        self.events_df: pd.DataFrame = events_df
+
+        dates = pd.Series(dates) if not isinstance(dates, pd.Series) else dates
+        if not pd.api.types.is_datetime64_any_dtype(dates):
+            dates = pd.to_datetime(dates)
+        self.dates: pd.Series = dates
+
+        # Ensure event dates are datetime without rewriting the frame
+        event_dates = events_df['Date']
+        if not pd.api.types.is_datetime64_any_dtype(event_dates):
+            event_dates = pd.to_datetime(event_dates)
+
+        # Structure-of-arrays working set: the three columns the window
+        # lookups read, ordered by date in one argsort pass, so
+        # searchsorted slices land on contiguous numpy arrays
+        dates_ns = event_dates.to_numpy(dtype='datetime64[ns]')
+        order = np.argsort(dates_ns, kind='stable')
+        self._event_dates_ns: np.ndarray = dates_ns[order]
+        self._event_desc: np.ndarray = events_df['Event'].to_numpy()[order]
+        self._event_cat: np.ndarray = events_df['Category'].to_numpy()[order]
     
     def correlate_changepoints(self, changepoint_indices: List[int], window_days: int = 30) -> List[CorrelationResult]:
         """
@@ -66,44 +107,48 @@ class EventCorrelator:
         list of CorrelationResult
         """
         results: List[CorrelationResult] = []
-        
+
+        dates_ns = self.dates.to_numpy(dtype='datetime64[ns]')
+        window = np.timedelta64(window_days, 'D')
+
         for idx in changepoint_indices:
             if idx >= len(self.dates):
                 print(f"Warning: Changepoint index {idx} exceeds date range")
                 continue
-            
+
             changepoint_date = self.dates.iloc[idx]
-            
-            start_date = changepoint_date - timedelta(days=window_days)
-            end_date = changepoint_date + timedelta(days=window_days)
-            
-            mask = (self.events_df['Date'] >= start_date) & (self.events_df['Date'] <= end_date)
-            nearby_events = self.events_df[mask].copy()
-            
-            event_list: List[Dict[str, any]] = []
-            for _, event_row in nearby_events.iterrows():
-                event_date = event_row['Date']
-                days_diff = (event_date - changepoint_date).days
-                proximity_score = self.calculate_proximity_score(
-                    changepoint_date, event_date, max_days=window_days
-                )
-                
-                event_list.append({
-                    'event_date': event_date,
-                    'description': event_row['Event'],
-                    'category': event_row['Category'],
-                    'proximity_score': proximity_score,
-                    'days_difference': days_diff
-                })
-            
-            event_list.sort(key=lambda x: x['proximity_score'], reverse=True)
-            
+            cp_ns = dates_ns[idx]
+
+            # Binary-search the sorted event dates for the window bounds
+            left = np.searchsorted(self._event_dates_ns, cp_ns - window, 'left')
+            right = np.searchsorted(self._event_dates_ns, cp_ns + window, 'right')
+
+            event_dates = pd.to_datetime(self._event_dates_ns[left:right])
+            days = ((self._event_dates_ns[left:right] - cp_ns)
+                    // np.timedelta64(1, 'D')).astype(np.int64)
+            descs = self._event_desc[left:right]
+            cats = self._event_cat[left:right]
+
+            # One ufunc pass scores the whole window instead of a Python
+            # calculate_proximity_score call per event
+            scores = np.maximum(0.0, 1.0 - np.abs(days) / window_days)
+
+            # Rank by descending score with argsort and reorder the
+            # columns once, rather than sorting dicts with a lambda key
+            order = np.argsort(-scores, kind='stable')
+
             results.append(CorrelationResult(
                 changepoint_index=idx,
                 changepoint_date=changepoint_date,
-                events=event_list
+                events=EventWindow(
+                    event_dates=event_dates[order],
+                    descriptions=descs[order],
+                    categories=cats[order],
+                    proximity_scores=scores[order],
+                    days_differences=days[order]
+                )
             ))
-        
+
         return results
     
     def calculate_proximity_score(self, changepoint_date: datetime, event_date: datetime, max_days: int = 30) -> float:
@@ -217,11 +262,12 @@ if __name__ == "__main__":
     for result in results:
         print(f"\nChangepoint at index {result.changepoint_index} "
               f"({result.changepoint_date.strftime('%Y-%m-%d')}):")
-        if result.events:
-            for i, event in enumerate(result.events[:3], 1):  # Show top 3
-                print(f"  {i}. {event['description']}")
-                print(f"     Date: {event['event_date'].strftime('%Y-%m-%d')}, "
-                      f"Proximity: {event['proximity_score']:.2f}, "
-                      f"Days diff: {event['days_difference']}")
+        window = result.events
+        if len(window):
+            for i in range(min(3, len(window))):  # Show top 3
+                print(f"  {i + 1}. {window.descriptions[i]}")
+                print(f"     Date: {pd.Timestamp(window.event_dates[i]).strftime('%Y-%m-%d')}, "
+                      f"Proximity: {window.proximity_scores[i]:.2f}, "
+                      f"Days diff: {window.days_differences[i]}")
         else:
             print("  No events found in time window")
\ No newline at end of file
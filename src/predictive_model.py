@@ -2,12 +2,25 @@
 Predictive modeling module using VAR and SHAP for explainability.
 """
 
+import itertools
+import os
+import sys
 from typing import Optional
 
 import pandas as pd
 import numpy as np
 from statsmodels.tsa.api import VAR
 import shap
+import matplotlib
+# Prefer the non-interactive Agg backend for batch runs: it skips any
+# GUI event loop and renders straight to the PNG buffer. Only switch
+# when nothing has chosen a backend yet -- an explicit MPLBACKEND or an
+# already-active interactive/inline backend (notebooks) must win, or
+# importing this module would silently kill inline rendering.
+if ('MPLBACKEND' not in os.environ
+        and 'matplotlib.pyplot' not in sys.modules
+        and 'IPython' not in sys.modules):
+    matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 
 
@@ -35,21 +48,22 @@ class PredictiveModel:
         # Extract coefficients properly from VAR results
         params_df = self.results.params
         
-        # Handle both Series and DataFrame cases
+        # Handle both Series and DataFrame cases; take np.abs once and
+        # reuse it for both the ranking and the heatmap below
         if isinstance(params_df, pd.DataFrame):
-            # If it's a DataFrame, flatten it
-            coefs = np.abs(params_df.values.flatten())
-            feature_names = []
-            for col in params_df.columns:
-                for idx in params_df.index:
-                    feature_names.append(f"{col}_{idx}")
+            abs_params = np.abs(params_df.values)
+            coefs = abs_params.ravel()
+            # Row-major ravel: index varies outermost, columns innermost
+            feature_names = [
+                f"{col}_{idx}"
+                for idx, col in itertools.product(params_df.index, params_df.columns)
+            ]
         else:
             # If it's a Series
-            coefs = np.abs(params_df.values)
+            abs_params = None
+            coefs = np.abs(params_df.values).ravel()
             feature_names = params_df.index.tolist()
-        
-        # Ensure both are 1D and same length
-        coefs = coefs.flatten()
+
         if len(feature_names) != len(coefs):
             feature_names = [f"Feature_{i}" for i in range(len(coefs))]
         
@@ -67,18 +81,20 @@ class PredictiveModel:
         plt.xlabel('Coefficient Magnitude (Importance)')
         plt.title('VAR Model Feature Importance\n(Absolute Coefficient Values)')
         plt.gca().invert_yaxis()
+        # tight_layout() up front instead of bbox_inches='tight', which
+        # would render the figure a second time just to measure the bbox
         plt.tight_layout()
-        plt.savefig("../outputs/figures/var_feature_importance.png", dpi=300, bbox_inches='tight')
+        plt.savefig("../outputs/figures/var_feature_importance.png", dpi=150, bbox_inches=None)
         plt.close()
         
         print(f"✓ Feature importance plot saved to outputs/figures/var_feature_importance.png")
         
         # Also create a coefficient heatmap for lagged effects
         try:
-            if isinstance(params_df, pd.DataFrame):
-                coef_matrix = np.abs(params_df.values)
+            if abs_params is not None:
+                coef_matrix = abs_params
             else:
-                coef_matrix = np.abs(params_df.values).reshape(self.results.k_ar, -1)
+                coef_matrix = coefs.reshape(self.results.k_ar, -1)
             
             plt.figure(figsize=(10, 8))
             plt.imshow(coef_matrix.T, aspect='auto', cmap='YlOrRd')
@@ -92,7 +108,7 @@ class PredictiveModel:
             else:
                 plt.yticks(range(coef_matrix.shape[1]), ['Price', 'Returns'])
             plt.tight_layout()
-            plt.savefig("../outputs/figures/var_coefficient_heatmap.png", dpi=300, bbox_inches='tight')
+            plt.savefig("../outputs/figures/var_coefficient_heatmap.png", dpi=150, bbox_inches=None)
             plt.close()
             
             print(f"✓ Coefficient heatmap saved to outputs/figures/var_coefficient_heatmap.png")
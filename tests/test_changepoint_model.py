@@ -30,4 +30,45 @@ def test_summary(sample_data):
     model.build_model()
     model.fit(draws=100, tune=100, chains=1, cores=1)
     summary = model.summary()
-    assert "tau[0]" in summary.index or "tau" in summary.index
\ No newline at end of file
+    assert "tau[0]" in summary.index or "tau" in summary.index
+
+def test_build_marginalized_model(sample_data):
+    model = BayesianChangePointModel(sample_data, n_changepoints=1)
+    built_model = model.build_marginalized_model()
+    assert built_model is not None
+    assert "mu" in built_model.named_vars
+    assert "sigma" in built_model.named_vars
+
+def test_fit_binseg_two_regimes():
+    np.random.seed(0)
+    data = np.concatenate([np.random.normal(0, 0.5, 100),
+                           np.random.normal(5, 0.5, 100)])
+    model = BayesianChangePointModel(data, n_changepoints=1)
+    result = model.fit_binseg()
+    assert len(result.changepoints) == 1
+    assert abs(result.changepoints[0] - 100) <= 5
+    assert abs(result.means[0] - 0) < 0.3
+    assert abs(result.means[1] - 5) < 0.3
+
+def test_fit_binseg_three_regimes():
+    np.random.seed(1)
+    data = np.concatenate([np.random.normal(0, 0.5, 80),
+                           np.random.normal(4, 0.5, 80),
+                           np.random.normal(-3, 0.5, 80)])
+    model = BayesianChangePointModel(data, n_changepoints=2)
+    result = model.fit_binseg()
+    assert len(result.changepoints) == 2
+    assert abs(result.changepoints[0] - 80) <= 5
+    assert abs(result.changepoints[1] - 160) <= 5
+    assert abs(result.means[0] - 0) < 0.3
+    assert abs(result.means[1] - 4) < 0.3
+    assert abs(result.means[2] + 3) < 0.3
+
+def test_fit_binseg_penalty_stops_on_no_change():
+    np.random.seed(2)
+    data = np.random.normal(0, 1, 500)
+    model = BayesianChangePointModel(data, n_changepoints=3)
+    result = model.fit_binseg()
+    # Pure noise: the BIC-style penalty rejects every candidate split
+    assert len(result.changepoints) == 0
+    assert len(result.means) == 1
\ No newline at end of file
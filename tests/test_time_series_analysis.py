@@ -91,6 +91,42 @@ def test_get_descriptive_stats(sample_price_df):
     assert 'max' in stats['Price Statistics'].index
 
 
+def test_calculate_weighted_ma(sample_price_df):
+    """Test weighted moving average against a pandas rolling reference."""
+    analyzer = TimeSeriesAnalyzer(sample_price_df, dtype=np.float64)
+    analyzer.calculate_weighted_ma(window=10)
+
+    assert 'WMA_10' in analyzer.df.columns
+    assert analyzer.df['WMA_10'].iloc[:9].isna().all()
+
+    weights = np.arange(1, 11, dtype=np.float64)
+    weights = weights / weights.sum()
+    expected = sample_price_df['Price'].rolling(10).apply(
+        lambda x: np.dot(x, weights), raw=True)
+    np.testing.assert_allclose(
+        analyzer.df['WMA_10'].to_numpy()[9:], expected.to_numpy()[9:])
+
+
+def test_cache_round_trip(tmp_path, sample_price_df):
+    """Test that to_cache/from_cache restores the augmented frame."""
+    analyzer = TimeSeriesAnalyzer(sample_price_df)
+    analyzer.calculate_moving_averages(windows=[10])
+    analyzer.calculate_volatility(windows=[10])
+
+    path = str(tmp_path / 'analyzer_cache.parquet')
+    analyzer.to_cache(path)
+    restored = TimeSeriesAnalyzer.from_cache(path)
+
+    assert restored.price_col == 'Price'
+    assert restored.date_col == analyzer.df.index.name
+    pd.testing.assert_frame_equal(restored.df, analyzer.df)
+
+    # Restored columns short-circuit recomputation
+    df_before = restored.df
+    restored.calculate_moving_averages(windows=[10])
+    assert restored.df is df_before
+
+
 def test_calculate_volatility_creates_returns(sample_price_df):
     """Test that volatility calculation creates Returns column if missing."""
     analyzer = TimeSeriesAnalyzer(sample_price_df)